@@ -1,4 +1,4 @@
 """FastAPI integration for Taskiq project."""
-from taskiq_fastapi.initializator import init, populate_dependency_context
+from taskiq_fastapi.initializator import init, init_sync, populate_dependency_context
 
-__all__ = ["init", "populate_dependency_context"]
+__all__ = ["init", "init_sync", "populate_dependency_context"]
@@ -1,45 +1,96 @@
-from typing import Awaitable, Callable, Union
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional, Union
 
 from fastapi import FastAPI, Request
 from starlette.requests import HTTPConnection
 from taskiq import AsyncBroker, TaskiqEvents, TaskiqState
-from taskiq.cli.utils import import_object
+
+_WORKER_STARTUP = TaskiqEvents.WORKER_STARTUP
+_WORKER_SHUTDOWN = TaskiqEvents.WORKER_SHUTDOWN
+_STATE_KEY = "_taskiq_fastapi"
+
+
+class _TaskiqFastAPIState:
+    """Objects that worker keeps between startup and shutdown."""
+
+    __slots__ = ("lifespans",)
+
+    def __init__(self) -> None:
+        self.lifespans: Dict[FastAPI, Any] = {}
+
+
+def _resolve_app(app_or_path: Union[str, FastAPI]) -> FastAPI:
+    """
+    Resolve FastAPI application.
+
+    :param app_or_path: application, its factory or path to any of them.
+    :raises ValueError: if resolved object is not a FastAPI application.
+    :return: fastapi application.
+    """
+    if type(app_or_path) is FastAPI:
+        return app_or_path
+
+    app: Any = app_or_path
+    if isinstance(app_or_path, str):
+        from taskiq.cli.utils import import_object
+
+        app = import_object(app_or_path)
+
+    if not isinstance(app, FastAPI):
+        app = app()
+
+    if not isinstance(app, FastAPI):
+        raise ValueError(f"'{app_or_path}' is not a FastAPI application.")
+
+    return app
 
 
 def startup_event_generator(
     broker: AsyncBroker,
     app_or_path: Union[str, FastAPI],
+    *,
+    include_http_connection: bool = True,
 ) -> Callable[[TaskiqState], Awaitable[None]]:
     """
-    Generate shutdown event.
+    Generate startup event.
 
     This function takes FastAPI application path
     and runs startup event on broker's startup.
 
+    Application is resolved on the first startup
+    and reused afterwards.
+
     :param broker: current broker.
-    :param app_path: fastapi application path.
+    :param app_or_path: fastapi application or path to it.
+    :param include_http_connection: whether to inject HTTPConnection.
     :returns: startup handler.
     """
+    app: Optional[FastAPI] = None
+    lifespan_context: Any = None
 
     async def startup(state: TaskiqState) -> None:
+        nonlocal app, lifespan_context
         if not broker.is_worker_process:
             return
-        if isinstance(app_or_path, str):
-            app = import_object(app_or_path)
-        else:
-            app = app_or_path
-
-        if not isinstance(app, FastAPI):
-            app = app()
-
-        if not isinstance(app, FastAPI):
-            raise ValueError(f"'{app_or_path}' is not a FastAPI application.")
+        if app is None:
+            app = _resolve_app(app_or_path)
+            lifespan_context = app.router.lifespan_context
+
+        running = state.get(_STATE_KEY)
+        if running is None:
+            running = state[_STATE_KEY] = _TaskiqFastAPIState()
+        if app in running.lifespans:
+            return
 
-        state.fastapi_app = app
-        await app.router.startup()
-        state.lf_ctx = app.router.lifespan_context(app)
-        await state.lf_ctx.__aenter__()
-        populate_dependency_context(broker, app)
+        state["fastapi_app"] = app
+        lf_ctx = lifespan_context(app)
+        asgi_state = await lf_ctx.__aenter__()
+        running.lifespans[app] = lf_ctx
+        populate_dependency_context(
+            broker,
+            app,
+            asgi_state,
+            include_http_connection=include_http_connection,
+        )
 
     return startup
 
@@ -58,15 +109,21 @@ def shutdown_event_generator(
     """
 
     async def shutdown(state: TaskiqState) -> None:
-        if not broker.is_worker_process:
+        running = state.get(_STATE_KEY)
+        if running is None or not running.lifespans:
             return
-        await state.fastapi_app.router.shutdown()
-        await state.lf_ctx.__aexit__(None, None, None)
+        _, lf_ctx = running.lifespans.popitem()
+        await lf_ctx.__aexit__(None, None, None)
 
     return shutdown
 
 
-def init(broker: AsyncBroker, app_or_path: Union[str, FastAPI]) -> None:
+def init(
+    broker: AsyncBroker,
+    app_or_path: Union[str, FastAPI],
+    *,
+    include_http_connection: bool = True,
+) -> None:
     """
     Add taskiq startup events.
 
@@ -78,34 +135,90 @@ def init(broker: AsyncBroker, app_or_path: Union[str, FastAPI]) -> None:
     startup events will run.
 
     :param broker: current broker to use.
-    :param app_path: path to fastapi application.
+    :param app_or_path: fastapi application or path to it.
+    :param include_http_connection: whether to inject HTTPConnection.
     """
+    # We cannot check broker.is_worker_process here,
+    # because worker sets it only after the broker is imported,
+    # so the check happens inside of startup handler.
     broker.add_event_handler(
-        TaskiqEvents.WORKER_STARTUP,
-        startup_event_generator(broker, app_or_path),
+        _WORKER_STARTUP,
+        startup_event_generator(
+            broker,
+            app_or_path,
+            include_http_connection=include_http_connection,
+        ),
     )
 
     broker.add_event_handler(
-        TaskiqEvents.WORKER_SHUTDOWN,
+        _WORKER_SHUTDOWN,
         shutdown_event_generator(broker),
     )
 
 
-def populate_dependency_context(broker: AsyncBroker, app: FastAPI) -> None:
+def init_sync(
+    broker: AsyncBroker,
+    app_or_path: Union[str, FastAPI],
+    *,
+    include_http_connection: bool = True,
+) -> None:
+    """
+    Integrate FastAPI with taskiq without startup events.
+
+    This function resolves the application right away
+    and populates broker's dependency context.
+
+    It's useful for InMemoryBroker and tests, where
+    the application is already importable and its lifespan
+    is not managed by taskiq.
+
+    :param broker: current broker to use.
+    :param app_or_path: fastapi application or path to it.
+    :param include_http_connection: whether to inject HTTPConnection.
+    """
+    app = _resolve_app(app_or_path)
+    broker.state["fastapi_app"] = app
+    populate_dependency_context(
+        broker,
+        app,
+        include_http_connection=include_http_connection,
+    )
+
+
+def populate_dependency_context(
+    broker: AsyncBroker,
+    app: FastAPI,
+    asgi_state: Optional[Mapping[str, Any]] = None,
+    *,
+    include_http_connection: bool = True,
+) -> None:
     """
     Populate dependency context.
 
     This function injects the Request and HTTPConnection
     into the broker's dependency context.
 
+    Scope for both objects is built once, but every
+    resolution gets new objects with their own state,
+    so tasks don't share anything stored on it.
+
     It may be need to be called manually if you are using InMemoryBroker.
 
     :param broker: current broker to use.
     :param app: current application.
+    :param asgi_state: state returned by application's lifespan.
+    :param include_http_connection: whether to inject HTTPConnection.
     """
-    broker.dependency_overrides.update(
-        {
-            Request: lambda: Request(scope={"app": app, "type": "http"}),
-            HTTPConnection: lambda: HTTPConnection(scope={"app": app, "type": "http"}),
-        },
-    )
+    scope: Dict[str, Any] = {
+        "app": app,
+        "type": "http",
+        "state": asgi_state if asgi_state is not None else {},
+    }
+
+    def copy_scope() -> Dict[str, Any]:
+        return {**scope, "state": dict(scope["state"])}
+
+    overrides = broker.dependency_overrides
+    overrides[Request] = lambda: Request(scope=copy_scope())
+    if include_http_connection:
+        overrides[HTTPConnection] = lambda: HTTPConnection(scope=copy_scope())